@@ -7,52 +7,19 @@ Now detects bold text for subcategories and starts from row 10
 from extractor_base import BaseExtractor
 import pandas as pd
 import re
-from openpyxl import load_workbook
+
+_WS_RE = re.compile(r'\s+')
+_NUMERIC_RE = re.compile(r'^[\d,\.]+$')
+_MEASUREMENT_RE = re.compile(r'\d+(?:mm|m|kg|tonnes?)\b')
+# Number glued to a thk/dp suffix, e.g. 150thk -> 150mm thick, 2dp -> 2m deep
+_DIMENSION_RE = re.compile(r'(\d+)(thk|dp)')
+_DIMENSION_SUFFIXES = {'thk': 'mm thick', 'dp': 'm deep'}
 
 class GroundworksExtractor(BaseExtractor):
     def __init__(self, excel_file='MJD-PRICELIST.xlsx'):
         super().__init__(excel_file, 'Groundworks')
-        self.workbook = None
-        self.worksheet = None
         self.current_subcategory = 'Groundworks'  # Default subcategory
         
-    def load_workbook_for_formatting(self):
-        """Load workbook with openpyxl to access formatting"""
-        try:
-            self.workbook = load_workbook(self.excel_file, data_only=True)
-            self.worksheet = self.workbook[self.sheet_name]
-            print(f"Loaded workbook for formatting detection")
-        except Exception as e:
-            print(f"Warning: Could not load workbook for formatting: {e}")
-            self.worksheet = None
-    
-    def is_row_bold(self, row_idx):
-        """Check if all non-empty cells in a row are bold"""
-        if not self.worksheet:
-            return False
-        
-        try:
-            # Excel rows are 1-indexed
-            excel_row = row_idx + 1
-            row_is_bold = False
-            has_content = False
-            
-            # Check first 5 columns for bold text
-            for col in range(1, 6):
-                cell = self.worksheet.cell(row=excel_row, column=col)
-                if cell.value:
-                    has_content = True
-                    if cell.font and cell.font.bold:
-                        row_is_bold = True
-                    else:
-                        # If any cell with content is not bold, row is not fully bold
-                        return False
-            
-            return has_content and row_is_bold
-        except Exception as e:
-            return False
-        
-    
     def extract_description(self, row, start_col=1):
         """Extract and clean description from columns B and C primarily"""
         description_parts = []
@@ -67,7 +34,7 @@ class GroundworksExtractor(BaseExtractor):
         if len(row) > 2 and pd.notna(row[2]):
             part = str(row[2]).strip()
             # Only add if it's not a unit and not a number
-            if part and not self.is_unit(part) and not re.match(r'^[\d,\.]+$', part):
+            if part and not self.is_unit(part) and not _NUMERIC_RE.match(part):
                 description_parts.append(part)
         
         description = ' '.join(description_parts)
@@ -91,15 +58,15 @@ class GroundworksExtractor(BaseExtractor):
             description = description.replace(old, new)
         
         # Fix patterns
-        description = re.sub(r'(\d+)thk', r'\1mm thick', description)
-        description = re.sub(r'(\d+)dp', r'\1m deep', description)
+        description = _DIMENSION_RE.sub(
+            lambda m: m.group(1) + _DIMENSION_SUFFIXES[m.group(2)], description)
         
         # Clean up spaces
-        description = ' '.join(description.split())
+        description = _WS_RE.sub(' ', description).strip()
         
         return description
     
-    def extract_unit(self, row):
+    def extract_unit(self, row, inferred_unit=None):
         """Extract unit from row - primarily column E (index 4)"""
         # Check column E first (index 4) - this is the primary unit column
         if len(row) > 4 and pd.notna(row[4]):
@@ -121,8 +88,14 @@ class GroundworksExtractor(BaseExtractor):
                     return unit_map.get(value.lower(), value)
         
         # Infer from description if not found
-        desc = self.extract_description(row)
-        desc_lower = desc.lower()
+        if inferred_unit is None:
+            inferred_unit = self.infer_unit_from_description(self.extract_description(row))
+        return inferred_unit
+    
+    def infer_unit_from_description(self, description, desc_lower=None):
+        """Infer unit from description content"""
+        if desc_lower is None:
+            desc_lower = description.lower()
         
         if any(word in desc_lower for word in ['excavat', 'disposal', 'fill']):
             if 'surface' in desc_lower or 'strip' in desc_lower:
@@ -135,9 +108,10 @@ class GroundworksExtractor(BaseExtractor):
         
         return 'item'
     
-    def determine_subcategory(self, description):
+    def determine_subcategory(self, description, desc_lower=None):
         """Determine subcategory based on description"""
-        desc_lower = description.lower()
+        if desc_lower is None:
+            desc_lower = description.lower()
         
         if 'excavat' in desc_lower:
             if 'reduced level' in desc_lower:
@@ -160,13 +134,14 @@ class GroundworksExtractor(BaseExtractor):
         else:
             return 'Groundworks'
     
-    def generate_keywords(self, description):
+    def generate_keywords(self, description, desc_lower=None):
         """Generate search keywords"""
         keywords = []
-        desc_lower = description.lower()
+        if desc_lower is None:
+            desc_lower = description.lower()
         
         # Extract measurements
-        measurements = re.findall(r'\d+(?:mm|m|kg|tonnes?)\b', desc_lower)
+        measurements = _MEASUREMENT_RE.findall(desc_lower)
         keywords.extend(measurements[:2])
         
         # Key terms
@@ -195,6 +170,9 @@ class GroundworksExtractor(BaseExtractor):
         rows_processed = 0
         rows_skipped = 0
         
+        # Rate and rate column of every row, parsed column-wise up front
+        rates, rate_cols = self.build_rates()
+        
         # Process all rows starting from row 10
         start_row = 9  # Row 10 in Excel (0-indexed)
         
@@ -262,20 +240,20 @@ class GroundworksExtractor(BaseExtractor):
                 rows_skipped += 1
                 continue
             
+            # Description-derived fields, cached per description
+            desc_subcategory, keywords, inferred_unit = self.describe(description)
+            
             # Extract unit
-            unit = self.extract_unit(row)
+            unit = self.extract_unit(row, inferred_unit=inferred_unit)
             
             # Extract rate and column index
-            rate, rate_col_idx = self.extract_rate(row)
+            rate, rate_col_idx = rates[row_idx], rate_cols[row_idx]
             
             # Use current subcategory (from bold header) or determine from keywords as fallback
             if current_subcategory and current_subcategory != 'Groundworks':
                 subcategory = current_subcategory
             else:
-                subcategory = self.determine_subcategory(description)
-            
-            # Generate keywords
-            keywords = self.generate_keywords(description)
+                subcategory = desc_subcategory
             
             # Create item with actual code
             item = self.create_item(
@@ -287,7 +265,7 @@ class GroundworksExtractor(BaseExtractor):
                 subcategory=subcategory,
                 rate=rate,
                 rate_col_idx=rate_col_idx,
-                keywords=keywords
+                keywords=list(keywords)
             )
             
             items.append(item)
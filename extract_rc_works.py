@@ -5,52 +5,73 @@ Uses actual Excel codes, includes sheet name in cell references, and detects bol
 
 from extractor_base import BaseExtractor
 import pandas as pd
+import numpy as np
 import re
-from openpyxl import load_workbook
+
+def is_sheet_column(col_idx):
+    """pd.read_excel usecols - only columns A:J (code, description, unit, rates) are used"""
+    # A callable rather than a column list, so sheets narrower than A:J still load
+    return col_idx < 10
+
+_WS_RE = re.compile(r'\s+')
+# Characters of a plain number like 1,250.00
+_NUMERIC_CHARS = '0123456789,.'
+_THK_RE = re.compile(r'(\d+)thk')
+_DIA_RE = re.compile(r'(\d+)dia')
+_GRADE_RE = re.compile(r'c\d+(?:/\d+)?')
+_THICK_RE = re.compile(r'\d+(?:mm)?\s*thick')
+
+# Keyword groups for subcategory/unit dispatch - plain substring alternations,
+# so each group is one scan with the same meaning as `any(w in desc_lower ...)`
+_STEEL_RE = re.compile(r'reinforcement|rebar|steel')
+_FORMWORK_RE = re.compile(r'formwork|shutter')
+_SLAB_FINISH_RE = re.compile(r'slab|surface|topping|screed|blinding')
+_MEMBER_RE = re.compile(r'beam|column|wall|foundation')
+_LINEAR_FORMWORK_RE = re.compile(r'edge|linear')
+_LINEAR_RE = re.compile(r'joint|groove|chase')
+_SOFFIT_RE = re.compile(r'slab|soffit')
+_VERTICAL_RE = re.compile(r'wall|vertical')
+
+# Key RC terms, in keyword output order
+KEYWORD_TERMS = ('concrete', 'reinforcement', 'formwork', 'rebar', 'mesh',
+                 'slab', 'beam', 'column', 'wall', 'foundation')
+
+# RC-specific abbreviations and their expansions
+ABBREVIATIONS = {
+    'rc': 'reinforced concrete',
+    'r.c.': 'reinforced concrete',
+    'conc': 'concrete',
+    'reinf': 'reinforcement',
+    'fwk': 'formwork',
+    'ne': 'not exceeding',
+    'n.e.': 'not exceeding',
+    'thk': 'thick',
+    'dia': 'diameter',
+    'c/c': 'centers',
+    'bwys': 'both ways',
+    'ew': 'each way',
+    't&b': 'top and bottom',
+    'u/s': 'underside',
+    'o/a': 'overall',
+    'incl': 'including',
+    'excl': 'excluding',
+    'horiz': 'horizontal',
+    'vert': 'vertical',
+}
+# Whole whitespace-delimited abbreviations
+_ABBREVIATION_RE = re.compile(
+    r'(?<!\S)(?:' + '|'.join(map(re.escape, ABBREVIATIONS)) + r')(?!\S)')
+
+def expand_abbreviation(match):
+    """re.sub callback for _ABBREVIATION_RE"""
+    return ABBREVIATIONS[match.group(0)]
 
 class RCWorksExtractor(BaseExtractor):
     def __init__(self, excel_file='MJD-PRICELIST.xlsx'):
         super().__init__(excel_file, 'RC works')
-        self.workbook = None
-        self.worksheet = None
+        self.sheet_columns = is_sheet_column
         self.current_subcategory = 'RC Works'  # Default subcategory
         
-    def load_workbook_for_formatting(self):
-        """Load workbook with openpyxl to access formatting"""
-        try:
-            self.workbook = load_workbook(self.excel_file, data_only=True)
-            self.worksheet = self.workbook[self.sheet_name]
-            print(f"Loaded workbook for formatting detection")
-        except Exception as e:
-            print(f"Warning: Could not load workbook for formatting: {e}")
-            self.worksheet = None
-    
-    def is_row_bold(self, row_idx):
-        """Check if all non-empty cells in a row are bold"""
-        if not self.worksheet:
-            return False
-        
-        try:
-            # Excel rows are 1-indexed
-            excel_row = row_idx + 1
-            row_is_bold = False
-            has_content = False
-            
-            # Check first 5 columns for bold text
-            for col in range(1, 6):
-                cell = self.worksheet.cell(row=excel_row, column=col)
-                if cell.value:
-                    has_content = True
-                    if cell.font and cell.font.bold:
-                        row_is_bold = True
-                    else:
-                        # If any cell with content is not bold, row is not fully bold
-                        return False
-            
-            return has_content and row_is_bold
-        except Exception as e:
-            return False
-    
     def extract_description(self, row, start_col=1):
         """Extract and clean description for RC works"""
         description_parts = []
@@ -65,47 +86,24 @@ class RCWorksExtractor(BaseExtractor):
         if len(row) > 2 and pd.notna(row[2]):
             part = str(row[2]).strip()
             # Only add if it's not a unit and not a number
-            if part and not self.is_unit(part) and not re.match(r'^[\d,\.]+$', part):
+            if part and not self.is_unit(part) and part.strip(_NUMERIC_CHARS):
                 description_parts.append(part)
         
         description = ' '.join(description_parts)
         
         # Clean and expand RC-specific abbreviations
-        replacements = {
-            ' rc ': ' reinforced concrete ',
-            ' r.c. ': ' reinforced concrete ',
-            ' conc ': ' concrete ',
-            ' reinf ': ' reinforcement ',
-            ' fwk ': ' formwork ',
-            ' ne ': ' not exceeding ',
-            ' n.e. ': ' not exceeding ',
-            ' thk ': ' thick ',
-            ' dia ': ' diameter ',
-            ' c/c ': ' centers ',
-            ' bwys ': ' both ways ',
-            ' ew ': ' each way ',
-            ' t&b ': ' top and bottom ',
-            ' u/s ': ' underside ',
-            ' o/a ': ' overall ',
-            ' incl ': ' including ',
-            ' excl ': ' excluding ',
-            ' horiz ': ' horizontal ',
-            ' vert ': ' vertical ',
-        }
-        
-        for old, new in replacements.items():
-            description = description.replace(old, new)
+        description = _ABBREVIATION_RE.sub(expand_abbreviation, description)
         
         # Fix patterns
-        description = re.sub(r'(\d+)thk', r'\1mm thick', description)
-        description = re.sub(r'(\d+)dia', r'\1mm diameter', description)
+        description = _THK_RE.sub(r'\1mm thick', description)
+        description = _DIA_RE.sub(r'\1mm diameter', description)
         
         # Clean up spaces
-        description = ' '.join(description.split())
+        description = _WS_RE.sub(' ', description).strip()
         
         return description
     
-    def extract_unit(self, row):
+    def extract_unit(self, row, description=None, inferred_unit=None):
         """Extract unit from row - primarily column E (index 4)"""
         # Check column E first (index 4) - this is the primary unit column
         if len(row) > 4 and pd.notna(row[4]):
@@ -121,35 +119,44 @@ class RCWorksExtractor(BaseExtractor):
                     return self.standardize_unit(value)
         
         # Infer from description if not found
-        desc = self.extract_description(row)
-        desc_lower = desc.lower()
+        if inferred_unit is None:
+            if description is None:
+                description = self.extract_description(row)
+            inferred_unit = self.infer_unit_from_description(description)
+        return inferred_unit
+    
+    def infer_unit_from_description(self, description, desc_lower=None):
+        """Infer unit from description content for RC works"""
+        if desc_lower is None:
+            desc_lower = description.lower()
         
         # RC works specific patterns
-        if 'reinforcement' in desc_lower or 'rebar' in desc_lower or 'steel' in desc_lower:
+        if _STEEL_RE.search(desc_lower):
             if 'mesh' in desc_lower:
                 return 'm2'
             return 'kg'
         elif 'concrete' in desc_lower:
-            if any(word in desc_lower for word in ['slab', 'surface', 'topping', 'screed', 'blinding']):
+            if _SLAB_FINISH_RE.search(desc_lower):
                 if 'thick' in desc_lower:
                     return 'm2'
-            elif any(word in desc_lower for word in ['beam', 'column', 'wall', 'foundation']):
+            elif _MEMBER_RE.search(desc_lower):
                 return 'm3'
             return 'm3'
-        elif 'formwork' in desc_lower or 'shutter' in desc_lower:
-            if 'edge' in desc_lower or 'linear' in desc_lower:
+        elif _FORMWORK_RE.search(desc_lower):
+            if _LINEAR_FORMWORK_RE.search(desc_lower):
                 return 'm'
             return 'm2'
         elif 'mesh' in desc_lower:
             return 'm2'
-        elif any(word in desc_lower for word in ['joint', 'groove', 'chase']):
+        elif _LINEAR_RE.search(desc_lower):
             return 'm'
         
         return 'item'
     
-    def determine_subcategory(self, description):
+    def determine_subcategory(self, description, desc_lower=None):
         """Determine subcategory based on description for RC works"""
-        desc_lower = description.lower()
+        if desc_lower is None:
+            desc_lower = description.lower()
         
         # RC works subcategories
         if 'concrete' in desc_lower:
@@ -177,17 +184,17 @@ class RCWorksExtractor(BaseExtractor):
                 return 'Blinding'
             else:
                 return 'Concrete Works'
-        elif 'reinforcement' in desc_lower or 'rebar' in desc_lower or 'steel' in desc_lower:
+        elif _STEEL_RE.search(desc_lower):
             if 'mesh' in desc_lower:
                 return 'Mesh Reinforcement'
             elif 'bar' in desc_lower:
                 return 'Bar Reinforcement'
             else:
                 return 'Steel Reinforcement'
-        elif 'formwork' in desc_lower or 'shutter' in desc_lower:
-            if 'slab' in desc_lower or 'soffit' in desc_lower:
+        elif _FORMWORK_RE.search(desc_lower):
+            if _SOFFIT_RE.search(desc_lower):
                 return 'Slab Formwork'
-            elif 'wall' in desc_lower or 'vertical' in desc_lower:
+            elif _VERTICAL_RE.search(desc_lower):
                 return 'Wall Formwork'
             elif 'beam' in desc_lower:
                 return 'Beam Formwork'
@@ -204,24 +211,22 @@ class RCWorksExtractor(BaseExtractor):
         else:
             return 'RC Works'
     
-    def generate_keywords(self, description):
+    def generate_keywords(self, description, desc_lower=None):
         """Generate search keywords for RC works"""
         keywords = []
-        desc_lower = description.lower()
+        if desc_lower is None:
+            desc_lower = description.lower()
         
         # Extract concrete grades
-        grades = re.findall(r'c\d+(?:/\d+)?', desc_lower)
+        grades = _GRADE_RE.findall(desc_lower)
         keywords.extend(grades[:2])
         
         # Extract thickness
-        thickness = re.findall(r'\d+(?:mm)?\s*thick', desc_lower)
+        thickness = _THICK_RE.findall(desc_lower)
         keywords.extend([t.replace(' ', '') for t in thickness[:1]])
         
         # Key RC terms
-        terms = ['concrete', 'reinforcement', 'formwork', 'rebar', 'mesh',
-                 'slab', 'beam', 'column', 'wall', 'foundation']
-        
-        for term in terms:
+        for term in KEYWORD_TERMS:
             if term in desc_lower:
                 keywords.append(term)
         
@@ -243,15 +248,28 @@ class RCWorksExtractor(BaseExtractor):
         rows_processed = 0
         rows_skipped = 0
         
+        # Rate and rate column of every row, parsed column-wise up front
+        rates, rate_cols = self.build_rates()
+        
         # Process all rows starting from row 12 (where data begins)
         start_row = 11  # Row 12 in Excel (0-indexed)
         
-        for row_idx in range(start_row, len(self.df)):
-            row = self.df.iloc[row_idx]
-            
-            # Skip if row is completely empty (but allow single-cell rows for potential headers)
-            if row.notna().sum() < 1:
-                continue
+        # Candidate data rows: column A has something and column B has text
+        first_str = self.df[0].astype(str).str.strip()
+        second_str = self.df[1].astype(str).str.strip()
+        is_data = (self.df[0].notna() & self.df[1].notna()
+                   & ~first_str.str.lower().isin(['', 'nan', 'none'])
+                   & (second_str.str.len() >= 5)).to_numpy()
+        is_data[:start_row] = False
+        
+        # Bold rows (potential subcategory headers) are visited in sheet order with the data rows
+        candidate_rows = sorted(set(np.flatnonzero(is_data).tolist())
+                                | {r for r in self._bold_row_set if start_row <= r < len(self.df)})
+        
+        # Only the candidate rows are copied out, as plain object rows
+        values = self.df.iloc[candidate_rows].to_numpy(dtype=object)
+        
+        for row_idx, row in zip(candidate_rows, values):
             
             # Check if this row is bold (potential subcategory header)
             if self.is_row_bold(row_idx):
@@ -269,32 +287,11 @@ class RCWorksExtractor(BaseExtractor):
                     print(f"Found subcategory at row {row_idx + 1}: {current_subcategory}")
                     continue  # Skip this row as it's a header
             
-            # Check if this is a data row
-            # Simple check - if column A has something and column B has text
-            first_col = row[0] if 0 < len(row) else None
-            second_col = row[1] if len(row) > 1 else None
-            
-            # Skip if column A is empty
-            if pd.isna(first_col):
-                continue
-                
-            # Skip if column B is empty or too short
-            if pd.isna(second_col):
+            if not is_data[row_idx]:
                 continue
-                
-            first_str = str(first_col).strip()
-            second_str = str(second_col).strip()
             
-            # Skip if column A has nothing meaningful
-            if not first_str or first_str.lower() in ['', 'nan', 'none']:
-                continue
-                
-            # Skip if column B is too short to be a description
-            if len(second_str) < 5:
-                continue
-                
             # Skip if column B is just a unit
-            if self.is_unit(second_str):
+            if self.is_unit(second_str.iat[row_idx]):
                 continue
             
             rows_processed += 1
@@ -310,20 +307,20 @@ class RCWorksExtractor(BaseExtractor):
                 rows_skipped += 1
                 continue
             
+            # Description-derived fields, cached per description
+            desc_subcategory, keywords, inferred_unit = self.describe(description)
+            
             # Extract unit
-            unit = self.extract_unit(row)
+            unit = self.extract_unit(row, inferred_unit=inferred_unit)
             
             # Extract rate and column index
-            rate, rate_col_idx = self.extract_rate(row)
+            rate, rate_col_idx = rates[row_idx], rate_cols[row_idx]
             
             # Use current subcategory (from bold header) or determine from keywords as fallback
             if current_subcategory and current_subcategory != 'RC Works':
                 subcategory = current_subcategory
             else:
-                subcategory = self.determine_subcategory(description)
-            
-            # Generate keywords
-            keywords = self.generate_keywords(description)
+                subcategory = desc_subcategory
             
             # Create item with actual code
             item = self.create_item(
@@ -335,7 +332,7 @@ class RCWorksExtractor(BaseExtractor):
                 subcategory=subcategory,
                 rate=rate,
                 rate_col_idx=rate_col_idx,
-                keywords=keywords
+                keywords=list(keywords)
             )
             
             items.append(item)
@@ -5,11 +5,154 @@ Handles the specific structure and format of the Services works pricelist
 
 import pandas as pd
 import numpy as np
-import json
 import re
 from datetime import datetime
+from collections import Counter
 from pathlib import Path
-import string
+from openpyxl import load_workbook
+from extractor_base import _COL_LETTERS, _NUMBER_RE, _RATE_STRIP
+
+# orjson serializes the output several times faster than the stdlib encoder
+import orjson
+
+# Only columns A:I (code, description, quantities, unit, rate) are used
+SHEET_COLUMNS = range(9)
+
+# Sheet sections by 0-based row range (inclusive), each with its own row layout
+SECTION_ROWS = {1: (12, 307), 2: (309, 345), 3: (347, 687), 4: (689, 806)}
+
+# Services codes often start with S, SV, M&E, or numbers
+_CODE_RE = re.compile(r'^(?:\d|(?i:S\d|SV|M&E)|[A-Z]+\d)')
+_WS_RE = re.compile(r'\s+')
+_NUMERIC_RE = re.compile(r'^[\d,\.]+$')
+
+# Services keywords - one alternation scans a cell once instead of per keyword
+SERVICES_KEYWORDS = ['electrical', 'plumbing', 'hvac', 'mechanical', 'cable',
+                     'conduit', 'wire', 'socket', 'switch', 'light', 'power',
+                     'distribution', 'panel', 'breaker', 'transformer',
+                     'water supply', 'hot water', 'cold water', 'gas',
+                     'ventilation', 'air conditioning', 'heating', 'boiler',
+                     'pump', 'valve', 'meter', 'sensor', 'control',
+                     'fire alarm', 'sprinkler', 'detection', 'emergency',
+                     'data', 'communication', 'network', 'telephone']
+_SERVICES_KEYWORD_RE = re.compile('|'.join(map(re.escape, SERVICES_KEYWORDS)))
+# Column B text in section 1 that is a heading row, not an item header
+_HEADER_SKIP_RE = re.compile('description|preambles|all items below')
+
+# Services-specific abbreviations, expanded when they appear between spaces
+# in lower or upper case. As with str.replace(' key ', ...), of a run of the
+# same token only every other one expands, since the space between is shared
+ABBREVIATIONS = {
+    'elec': 'electrical',
+    'mech': 'mechanical',
+    'hvac': 'HVAC',
+    'a/c': 'air conditioning',
+    'ac': 'air conditioning',
+    'hw': 'hot water',
+    'cw': 'cold water',
+    'lwc': 'low water content',
+    'swc': 'soil and waste',
+    'rwp': 'rainwater pipe',
+    'svp': 'soil vent pipe',
+    'dia': 'diameter',
+    'thk': 'thick',
+    'galv': 'galvanized',
+    'gi': 'galvanized iron',
+    'ms': 'mild steel',
+    'ss': 'stainless steel',
+    'cu': 'copper',
+    'pvc': 'PVC',
+    'cpvc': 'CPVC',
+    'ppr': 'PPR',
+    'hdpe': 'HDPE',
+    'incl': 'including',
+    'excl': 'excluding',
+    'c/w': 'complete with',
+    'w/': 'with',
+    'w/o': 'without',
+    'db': 'distribution board',
+    'mcb': 'miniature circuit breaker',
+    'mccb': 'molded case circuit breaker',
+    'rccb': 'residual current circuit breaker',
+    'fcu': 'fan coil unit',
+    'ahu': 'air handling unit',
+    'vrf': 'variable refrigerant flow',
+    'btu': 'BTU',
+    'tr': 'ton refrigeration',
+    'kw': 'kilowatt',
+    'hp': 'horsepower',
+    'lux': 'lux',
+    'ip': 'IP rating',
+    'cat': 'category',
+    'swa': 'steel wire armored',
+    'xlpe': 'XLPE',
+    'lv': 'low voltage',
+    'mv': 'medium voltage',
+    'hv': 'high voltage',
+}
+_ABBREVIATION_RE = re.compile(
+    r'(?<= )(?P<abbr>' + '|'.join(map(re.escape, [*ABBREVIATIONS, *map(str.upper, ABBREVIATIONS)]))
+    + r')(?= )(?: (?P=abbr)(?= ))?')
+
+# Description fix patterns, applied in order
+_DESCRIPTION_FIXES = [
+    (re.compile(r'(\d+)mm\s*dia(?!meter)'), r'\1mm diameter'),
+    (re.compile(r'(\d+)dia'), r'\1mm diameter'),
+    (re.compile(r'(\d+)thk'), r'\1mm thick'),
+    (re.compile(r'(\d+)sqmm'), r'\1 sq.mm'),
+    (re.compile(r'(\d+)c'), r'\1 core'),
+    (re.compile(r'(\d+)\s*[xX]\s*(\d+)'), r'\1x\2'),
+]
+
+UNITS = frozenset({'m', 'm2', 'm²', 'm3', 'm³', 'nr', 'no', 'item', 'sum',
+                   'kg', 'tonnes', 't', 'lm', 'sqm', 'cum', 'each', 'set',
+                   'point', 'kw', 'kva', 'amp', 'ton'})
+
+# Unit spellings mapped to their standard form
+UNIT_MAP = {
+    'm2': 'm²', 'sqm': 'm²', 'sq.m': 'm²',
+    'm3': 'm³', 'cum': 'm³', 'cu.m': 'm³',
+    'no': 'nr', 'no.': 'nr', 'each': 'nr',
+    't': 'tonnes', 'ton': 'tonnes', 'tonne': 'tonnes',
+    'lm': 'm', 'lin.m': 'm', 'l.m': 'm',
+    'pt': 'point', 'pts': 'point',
+}
+
+# Keyword vocabulary, in output order
+KEYWORD_MATERIALS = ['copper', 'pvc', 'cpvc', 'hdpe', 'galvanized', 'steel',
+                     'aluminum', 'xlpe', 'swa', 'armored']
+KEYWORD_TERMS = ['electrical', 'plumbing', 'hvac', 'cable', 'pipe', 'conduit',
+                 'panel', 'socket', 'switch', 'light', 'pump', 'valve',
+                 'air_conditioning', 'ventilation', 'fire_alarm']
+
+# Keyword extraction patterns
+_CABLE_SIZE_RE = re.compile(r'(\d+)\s*(?:x\s*)?(\d+)\s*(?:sq\.?mm|mm2)')
+_PIPE_SIZE_RE = re.compile(r'(\d+)mm\s*(?:diameter|dia)')
+_POWER_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(?:kw|kva|hp|amp)')
+
+# Keyword groups for unit inference - plain substring alternations, so each
+# group is one scan with the same meaning as `any(w in desc_lower ...)`
+_RUN_ITEM_RE = re.compile(r'cable|wire|conduit|pipe|duct')
+_INSTALL_RE = re.compile(r'install|laying|run')
+_CONNECTION_RE = re.compile(r'connection|termination')
+_POINT_ITEM_RE = re.compile(r'socket|switch|outlet|point|breaker')
+_EQUIPMENT_RE = re.compile(r'panel|board|unit|pump|motor')
+_FITTING_RE = re.compile(r'light|luminaire|fixture|fitting')
+_COMMISSIONING_RE = re.compile(r'testing|commissioning')
+_EARTHWORK_RE = re.compile(r'excavation|trench')
+_INSTRUMENT_RE = re.compile(r'valve|meter|sensor|detector')
+_POWER_UNIT_RE = re.compile(r'kw|kilowatt|kva')
+
+def expand_abbreviation(match):
+    """re.sub callback for _ABBREVIATION_RE - a repeated token after the first is kept as-is"""
+    abbr = match.group('abbr')
+    return ABBREVIATIONS[abbr.lower()] + match.group(0)[len(abbr):]
+
+def substring_mask(desc_lower, word, masks):
+    """Boolean array of where word occurs in desc_lower - each word is scanned once per masks dict"""
+    if word not in masks:
+        masks[word] = desc_lower.str.contains(word, regex=False).to_numpy(dtype=bool)
+    return masks[word]
 
 class ServicesExtractor:
     def __init__(self, excel_file='MJD-PRICELIST.xlsx'):
@@ -17,62 +160,56 @@ class ServicesExtractor:
         self.sheet_name = 'Services'
         self.df = None
         self.extracted_items = []
+        self._bold_row_set = frozenset()
         
     def load_sheet(self):
-        """Load the Services sheet"""
+        """Load the Services sheet, recording bold rows in the same read-only pass"""
         print(f"Loading {self.sheet_name} sheet...")
-        self.df = pd.read_excel(self.excel_file, sheet_name=self.sheet_name, header=None)
+        rows = []
+        bold_rows = []
+        workbook = load_workbook(self.excel_file, read_only=True, data_only=True)
+        try:
+            worksheet = workbook[self.sheet_name]
+            # The stored sheet size can be wrong - read to the last row actually present
+            worksheet.reset_dimensions()
+            for row_idx, cells in enumerate(worksheet.iter_rows(max_col=len(SHEET_COLUMNS))):
+                rows.append([cell.value for cell in cells])
+                # Bold text in column B marks subcategory/header rows
+                if len(cells) > 1 and cells[1].font and cells[1].font.bold:
+                    bold_rows.append(row_idx)
+        finally:
+            workbook.close()
+        self._bold_row_set = frozenset(bold_rows)
+        # Per-column dtype inference as pd.read_excel does, so numeric cells render the same
+        self.df = pd.DataFrame(rows).reindex(columns=SHEET_COLUMNS)
         print(f"Loaded {len(self.df)} rows x {len(self.df.columns)} columns")
         return self.df
     
     def identify_data_rows(self):
-        """Identify rows containing actual pricelist data"""
-        data_rows = []
+        """Identify rows containing actual pricelist data - returns an int index array"""
+        # Skip if row is mostly empty
+        filled = self.df.notna().sum(axis=1).to_numpy() >= 3
         
-        for idx, row in self.df.iterrows():
-            # Skip if row is mostly empty
-            if row.notna().sum() < 3:
-                continue
-                
-            # Look for patterns that indicate services data
-            code_col = row[0] if 0 < len(row) else None
-            if pd.notna(code_col):
-                code_str = str(code_col).strip()
-                # Services codes often start with S, SV, M&E, or numbers
-                if (re.match(r'^\d+', code_str) or 
-                    re.match(r'^S\d+', code_str, re.I) or
-                    re.match(r'^SV', code_str, re.I) or
-                    re.match(r'^M&E', code_str, re.I) or
-                    re.match(r'^[A-Z]+\d+', code_str)):
-                    data_rows.append(idx)
-                    continue
-            
-            # Check if row has services-related content
-            for col_idx in range(1, min(5, len(row))):
-                cell = row[col_idx]
-                if pd.notna(cell):
-                    cell_str = str(cell).strip().lower()
-                    # Services keywords
-                    if any(keyword in cell_str for keyword in 
-                           ['electrical', 'plumbing', 'hvac', 'mechanical', 'cable',
-                            'conduit', 'wire', 'socket', 'switch', 'light', 'power',
-                            'distribution', 'panel', 'breaker', 'transformer',
-                            'water supply', 'hot water', 'cold water', 'gas',
-                            'ventilation', 'air conditioning', 'heating', 'boiler',
-                            'pump', 'valve', 'meter', 'sensor', 'control',
-                            'fire alarm', 'sprinkler', 'detection', 'emergency',
-                            'data', 'communication', 'network', 'telephone']):
-                        data_rows.append(idx)
-                        break
-        
-        return data_rows
+        # Look for patterns that indicate services data
+        codes = self.df[0]
+        has_code = (codes.notna() & codes.astype(str).str.strip().str.match(_CODE_RE)).to_numpy()
+        
+        # Check if row has services-related content
+        has_keyword = np.zeros(len(self.df), dtype=bool)
+        for col_idx in range(1, min(5, len(self.df.columns))):
+            cells = self.df[col_idx]
+            has_keyword |= (cells.notna() & cells.astype(str).str.lower().str.contains(_SERVICES_KEYWORD_RE)).to_numpy()
+        
+        return np.flatnonzero(filled & (has_code | has_keyword))
     
-    def extract_code(self, row, col_idx=0):
-        """Extract code from row"""
-        if col_idx < len(row) and pd.notna(row[col_idx]):
+    def extract_code(self, row, col_idx=0, filled=None):
+        """Extract code from row - filled is the row's not-null mask, if already known"""
+        if filled is None:
+            filled = pd.notna(row)
+        if col_idx < len(row) and filled[col_idx]:
             code = str(row[col_idx]).strip()
             # Clean up code
-            code = re.sub(r'\s+', '', code)
+            code = _WS_RE.sub('', code)
             if code and not code.lower() in ['nan', 'none', '-', '']:
                 return code
         return None
@@ -86,249 +223,194 @@ class ServicesExtractor:
             if pd.notna(row[col_idx]):
                 part = str(row[col_idx]).strip()
                 # Skip if it's a number or unit
-                if not re.match(r'^[\d,\.]+$', part) and not self.is_unit(part):
+                if not _NUMERIC_RE.match(part) and not self.is_unit(part):
                     description_parts.append(part)
         
         description = ' '.join(description_parts)
         
         # Clean and expand services-specific abbreviations
-        replacements = {
-            ' elec ': ' electrical ',
-            ' mech ': ' mechanical ',
-            ' hvac ': ' HVAC ',
-            ' a/c ': ' air conditioning ',
-            ' ac ': ' air conditioning ',
-            ' hw ': ' hot water ',
-            ' cw ': ' cold water ',
-            ' lwc ': ' low water content ',
-            ' swc ': ' soil and waste ',
-            ' rwp ': ' rainwater pipe ',
-            ' svp ': ' soil vent pipe ',
-            ' dia ': ' diameter ',
-            ' thk ': ' thick ',
-            ' galv ': ' galvanized ',
-            ' gi ': ' galvanized iron ',
-            ' ms ': ' mild steel ',
-            ' ss ': ' stainless steel ',
-            ' cu ': ' copper ',
-            ' pvc ': ' PVC ',
-            ' cpvc ': ' CPVC ',
-            ' ppr ': ' PPR ',
-            ' hdpe ': ' HDPE ',
-            ' incl ': ' including ',
-            ' excl ': ' excluding ',
-            ' c/w ': ' complete with ',
-            ' w/ ': ' with ',
-            ' w/o ': ' without ',
-            ' db ': ' distribution board ',
-            ' mcb ': ' miniature circuit breaker ',
-            ' mccb ': ' molded case circuit breaker ',
-            ' rccb ': ' residual current circuit breaker ',
-            ' fcu ': ' fan coil unit ',
-            ' ahu ': ' air handling unit ',
-            ' vrf ': ' variable refrigerant flow ',
-            ' btu ': ' BTU ',
-            ' tr ': ' ton refrigeration ',
-            ' kw ': ' kilowatt ',
-            ' hp ': ' horsepower ',
-            ' lux ': ' lux ',
-            ' ip ': ' IP rating ',
-            ' cat ': ' category ',
-            ' swa ': ' steel wire armored ',
-            ' xlpe ': ' XLPE ',
-            ' lv ': ' low voltage ',
-            ' mv ': ' medium voltage ',
-            ' hv ': ' high voltage ',
-        }
-        
-        for old, new in replacements.items():
-            description = description.replace(old, new)
-            description = description.replace(old.upper(), new)
+        description = _ABBREVIATION_RE.sub(expand_abbreviation, description)
         
         # Fix patterns
-        description = re.sub(r'(\d+)mm\s*dia', r'\1mm diameter', description)
-        description = re.sub(r'(\d+)dia', r'\1mm diameter', description)
-        description = re.sub(r'(\d+)thk', r'\1mm thick', description)
-        description = re.sub(r'(\d+)sqmm', r'\1 sq.mm', description)
-        description = re.sub(r'(\d+)c', r'\1 core', description)
-        description = re.sub(r'(\d+)\s*[xX]\s*(\d+)', r'\1x\2', description)
+        for pattern, repl in _DESCRIPTION_FIXES:
+            description = pattern.sub(repl, description)
         
         # Clean up spaces
         description = ' '.join(description.split())
         
         return description
     
+    def build_descriptions(self, start_col=1, rows=None):
+        """Vectorized extract_description over every row of the sheet
+
+        With a boolean rows mask, only those rows are normalized and the rest are left ''.
+        """
+        parts = []
+        keeps = []
+        for col_idx in range(start_col, min(start_col + 3, len(self.df.columns))):
+            cells = self.df[col_idx]
+            text = cells.astype(str).str.strip()
+            # Skip if it's a number or unit
+            keep = cells.notna() & ~text.str.match(_NUMERIC_RE) & ~text.str.lower().isin(UNITS)
+            parts.append(text.where(keep, ''))
+            keeps.append(keep.to_numpy(dtype=bool))
+        
+        if not parts:
+            return pd.Series('', index=self.df.index)
+        
+        # Join the kept parts with single spaces, as ' '.join does - a kept
+        # whitespace-only cell still adds its separator, skipped cells add none
+        raw = parts[0]
+        started = keeps[0]
+        for part, keep in zip(parts[1:], keeps[1:]):
+            raw = raw + pd.Series(np.where(started & keep, ' ', ''), index=raw.index) + part
+            started = started | keep
+        descriptions = raw if rows is None else raw[rows]
+        descriptions = descriptions.str.replace(_ABBREVIATION_RE, expand_abbreviation, regex=True)
+        for pattern, repl in _DESCRIPTION_FIXES:
+            descriptions = descriptions.str.replace(pattern, repl, regex=True)
+        descriptions = descriptions.str.replace(_WS_RE, ' ', regex=True).str.strip()
+        
+        if rows is None:
+            return descriptions
+        return descriptions.reindex(raw.index, fill_value='')
+    
+    def build_rates(self, rate_col=8):
+        """Parse the rate column of every row at once - NaN where there is no positive rate"""
+        if rate_col >= len(self.df.columns):
+            return pd.Series(np.nan, index=self.df.index)
+        
+        cells = self.df[rate_col]
+        text = cells.astype(str).str.translate(_RATE_STRIP).str.strip()
+        numeric = cells.notna() & text.str.fullmatch(_NUMBER_RE)
+        # astype parses like float() - to_numeric's fast parser can be off in the last digit
+        rates = text.where(numeric).astype(np.float64).to_numpy()
+        valid = rates > 0
+        return pd.Series(np.where(valid, rates, np.nan), index=self.df.index)
+    
     def is_unit(self, value):
-        """Check if value is a unit"""
-        if pd.isna(value):
-            return False
-        
-        value_str = str(value).strip().lower()
-        
-        units = ['m', 'm2', 'm²', 'm3', 'm³', 'nr', 'no', 'item', 'sum',
-                 'kg', 'tonnes', 't', 'lm', 'sqm', 'cum', 'each', 'set',
-                 'point', 'kw', 'kva', 'amp', 'ton']
-        
-        return value_str in units
+        """Check if a stripped, non-empty cell string is a unit"""
+        return value.lower() in UNITS
     
-    def extract_unit(self, row, expected_col=None):
-        """Extract unit from row"""
+    def extract_unit(self, row, expected_col=None, description=None, desc_lower=None, filled=None):
+        """Extract unit from row, inferring it from the row's description as a fallback"""
+        if filled is None:
+            filled = pd.notna(row)
         # Try expected column first
         if expected_col is not None and expected_col < len(row):
-            if pd.notna(row[expected_col]):
+            if filled[expected_col]:
                 value = str(row[expected_col]).strip()
                 if self.is_unit(value):
                     return self.standardize_unit(value)
         
         # Search for unit in other columns
         for col_idx in range(2, min(6, len(row))):
-            if pd.notna(row[col_idx]):
+            if filled[col_idx]:
                 value = str(row[col_idx]).strip()
                 if self.is_unit(value):
                     return self.standardize_unit(value)
         
         # Infer from description
-        return self.infer_unit_from_description(row)
+        if description is None:
+            description = self.extract_description(row)
+        return self.infer_unit_from_description(description, desc_lower)
     
     def standardize_unit(self, unit):
         """Standardize unit format"""
-        unit_map = {
-            'm2': 'm²', 'sqm': 'm²', 'sq.m': 'm²',
-            'm3': 'm³', 'cum': 'm³', 'cu.m': 'm³',
-            'no': 'nr', 'no.': 'nr', 'each': 'nr',
-            't': 'tonnes', 'ton': 'tonnes', 'tonne': 'tonnes',
-            'lm': 'm', 'lin.m': 'm', 'l.m': 'm',
-            'pt': 'point', 'pts': 'point',
-        }
-        
         unit_lower = unit.lower()
-        return unit_map.get(unit_lower, unit_lower)
+        return UNIT_MAP.get(unit_lower, unit_lower)
     
-    def infer_unit_from_description(self, row):
+    def infer_unit_from_description(self, description, desc_lower=None):
         """Infer unit from description content for services"""
-        desc = self.extract_description(row)
-        desc_lower = desc.lower()
+        if desc_lower is None:
+            desc_lower = description.lower()
         
         # Services specific patterns
-        if any(word in desc_lower for word in ['cable', 'wire', 'conduit', 'pipe', 'duct']):
-            if 'install' in desc_lower or 'laying' in desc_lower or 'run' in desc_lower:
+        if _RUN_ITEM_RE.search(desc_lower):
+            if _INSTALL_RE.search(desc_lower):
                 return 'm'
-            elif 'connection' in desc_lower or 'termination' in desc_lower:
+            elif _CONNECTION_RE.search(desc_lower):
                 return 'nr'
             return 'm'
-        elif any(word in desc_lower for word in ['socket', 'switch', 'outlet', 'point', 'breaker']):
+        elif _POINT_ITEM_RE.search(desc_lower):
             return 'point'
-        elif any(word in desc_lower for word in ['panel', 'board', 'unit', 'pump', 'motor']):
+        elif _EQUIPMENT_RE.search(desc_lower):
             return 'nr'
-        elif any(word in desc_lower for word in ['light', 'luminaire', 'fixture', 'fitting']):
+        elif _FITTING_RE.search(desc_lower):
             return 'nr'
-        elif 'testing' in desc_lower or 'commissioning' in desc_lower:
+        elif _COMMISSIONING_RE.search(desc_lower):
             return 'sum'
-        elif any(word in desc_lower for word in ['excavation', 'trench']):
+        elif _EARTHWORK_RE.search(desc_lower):
             return 'm³'
         elif 'insulation' in desc_lower:
             if 'pipe' in desc_lower:
                 return 'm'
             return 'm²'
-        elif any(word in desc_lower for word in ['valve', 'meter', 'sensor', 'detector']):
+        elif _INSTRUMENT_RE.search(desc_lower):
             return 'nr'
-        elif any(word in desc_lower for word in ['kw', 'kilowatt', 'kva']):
+        elif _POWER_UNIT_RE.search(desc_lower):
             return 'kw'
         elif 'ton' in desc_lower and 'refrigeration' in desc_lower:
             return 'ton'
         
         return 'item'
     
-    def extract_rate(self, row, start_col=3):
-        """Extract rate value"""
-        for col_idx in range(start_col, min(start_col + 4, len(row))):
-            if pd.notna(row[col_idx]):
-                value = str(row[col_idx]).strip()
-                # Check if it's a number
-                value_clean = value.replace(',', '').replace('£', '').replace('$', '')
-                try:
-                    rate = float(value_clean)
-                    if rate > 0:  # Valid rate
-                        return rate
-                except:
-                    continue
-        return None
-    
-    def get_cell_reference(self, row_idx, col_idx):
-        """Convert row and column index to Excel cell reference"""
-        if col_idx < 26:
-            col_letter = string.ascii_uppercase[col_idx]
-        else:
-            col_letter = string.ascii_uppercase[col_idx // 26 - 1] + string.ascii_uppercase[col_idx % 26]
-        
-        return f"{col_letter}{row_idx + 1}"
-    
-    def determine_subcategory(self, description):
-        """Determine subcategory based on description for services"""
-        desc_lower = description.lower()
-        
-        # Services subcategories
-        if any(word in desc_lower for word in ['electrical', 'power', 'cable', 'wire']):
-            if 'distribution' in desc_lower or 'panel' in desc_lower or 'board' in desc_lower:
-                return 'Electrical Distribution'
-            elif 'cable' in desc_lower or 'wire' in desc_lower:
-                return 'Cables and Wiring'
-            elif 'light' in desc_lower or 'luminaire' in desc_lower:
-                return 'Lighting'
-            elif 'socket' in desc_lower or 'switch' in desc_lower or 'outlet' in desc_lower:
-                return 'Wiring Devices'
-            elif 'earthing' in desc_lower or 'grounding' in desc_lower:
-                return 'Earthing and Grounding'
-            else:
-                return 'Electrical Works'
-        elif any(word in desc_lower for word in ['plumbing', 'water', 'pipe']):
-            if 'hot water' in desc_lower:
-                return 'Hot Water System'
-            elif 'cold water' in desc_lower or 'potable' in desc_lower:
-                return 'Cold Water System'
-            elif 'waste' in desc_lower or 'soil' in desc_lower:
-                return 'Soil and Waste'
-            elif 'sanitary' in desc_lower or 'fixture' in desc_lower:
-                return 'Sanitary Fixtures'
-            else:
-                return 'Plumbing Works'
-        elif any(word in desc_lower for word in ['hvac', 'air conditioning', 'ventilation', 'heating']):
-            if 'air conditioning' in desc_lower or 'cooling' in desc_lower:
-                return 'Air Conditioning'
-            elif 'ventilation' in desc_lower or 'exhaust' in desc_lower:
-                return 'Ventilation System'
-            elif 'heating' in desc_lower or 'boiler' in desc_lower:
-                return 'Heating System'
-            elif 'duct' in desc_lower:
-                return 'Ductwork'
-            else:
-                return 'HVAC Works'
-        elif 'fire' in desc_lower:
-            if 'alarm' in desc_lower or 'detection' in desc_lower:
-                return 'Fire Alarm System'
-            elif 'sprinkler' in desc_lower or 'suppression' in desc_lower:
-                return 'Fire Fighting System'
-            elif 'extinguisher' in desc_lower:
-                return 'Fire Extinguishers'
-            else:
-                return 'Fire Protection'
-        elif any(word in desc_lower for word in ['data', 'network', 'communication', 'telephone']):
-            if 'structured cabling' in desc_lower:
-                return 'Structured Cabling'
-            elif 'network' in desc_lower:
-                return 'Network Infrastructure'
-            else:
-                return 'Low Current Systems'
-        elif 'gas' in desc_lower:
-            return 'Gas System'
-        elif 'lift' in desc_lower or 'elevator' in desc_lower:
-            return 'Vertical Transportation'
-        elif 'bms' in desc_lower or 'building management' in desc_lower:
-            return 'Building Management System'
-        elif 'testing' in desc_lower or 'commissioning' in desc_lower:
-            return 'Testing and Commissioning'
-        else:
-            return 'General Services'
+    def classify_subcategories(self, descriptions, desc_lower=None, masks=None):
+        """Determine the services subcategory of every description in a Series"""
+        if desc_lower is None:
+            desc_lower = descriptions.str.lower()
+        if masks is None:
+            masks = {}
+        
+        def has(*words):
+            # Substring masks are shared between branches that test the same word
+            mask = np.zeros(len(desc_lower), dtype=bool)
+            for word in words:
+                mask |= substring_mask(desc_lower, word, masks)
+            return mask
+        
+        # Groups are exclusive and checked in order; within a group the specific
+        # cases come before its fallback - np.select takes the first hit
+        electrical = has('electrical', 'power', 'cable', 'wire')
+        plumbing = ~electrical & has('plumbing', 'water', 'pipe')
+        hvac = ~electrical & ~plumbing & has('hvac', 'air conditioning', 'ventilation', 'heating')
+        other = ~electrical & ~plumbing & ~hvac
+        fire = other & has('fire')
+        low_current = other & ~fire & has('data', 'network', 'communication', 'telephone')
+        
+        conditions_choices = [
+            (electrical & has('distribution', 'panel', 'board'), 'Electrical Distribution'),
+            (electrical & has('cable', 'wire'), 'Cables and Wiring'),
+            (electrical & has('light', 'luminaire'), 'Lighting'),
+            (electrical & has('socket', 'switch', 'outlet'), 'Wiring Devices'),
+            (electrical & has('earthing', 'grounding'), 'Earthing and Grounding'),
+            (electrical, 'Electrical Works'),
+            (plumbing & has('hot water'), 'Hot Water System'),
+            (plumbing & has('cold water', 'potable'), 'Cold Water System'),
+            (plumbing & has('waste', 'soil'), 'Soil and Waste'),
+            (plumbing & has('sanitary', 'fixture'), 'Sanitary Fixtures'),
+            (plumbing, 'Plumbing Works'),
+            (hvac & has('air conditioning', 'cooling'), 'Air Conditioning'),
+            (hvac & has('ventilation', 'exhaust'), 'Ventilation System'),
+            (hvac & has('heating', 'boiler'), 'Heating System'),
+            (hvac & has('duct'), 'Ductwork'),
+            (hvac, 'HVAC Works'),
+            (fire & has('alarm', 'detection'), 'Fire Alarm System'),
+            (fire & has('sprinkler', 'suppression'), 'Fire Fighting System'),
+            (fire & has('extinguisher'), 'Fire Extinguishers'),
+            (fire, 'Fire Protection'),
+            (low_current & has('structured cabling'), 'Structured Cabling'),
+            (low_current & has('network'), 'Network Infrastructure'),
+            (low_current, 'Low Current Systems'),
+            (other & has('gas'), 'Gas System'),
+            (other & has('lift', 'elevator'), 'Vertical Transportation'),
+            (other & has('bms', 'building management'), 'Building Management System'),
+            (other & has('testing', 'commissioning'), 'Testing and Commissioning'),
+        ]
+        conditions = [condition for condition, _ in conditions_choices]
+        choices = [choice for _, choice in conditions_choices]
+        subcategories = np.select(conditions, choices, default='General Services')
+        return pd.Series(subcategories.astype(object), index=descriptions.index)
     
     def determine_work_type(self, description, subcategory):
         """Determine work type for services"""
@@ -353,70 +435,36 @@ class ServicesExtractor:
         else:
             return 'Services Works'
     
-    def generate_keywords(self, description, subcategory):
-        """Generate search keywords for services"""
-        keywords = []
-        desc_lower = description.lower()
-        
-        # Extract cable sizes
-        cable_sizes = re.findall(r'(\d+)\s*(?:x\s*)?(\d+)\s*(?:sq\.?mm|mm2)', desc_lower)
-        for size in cable_sizes[:1]:
-            keywords.append(f"{size[0]}x{size[1]}sqmm" if size[1] else f"{size[0]}sqmm")
-        
-        # Extract pipe sizes
-        pipe_sizes = re.findall(r'(\d+)mm\s*(?:diameter|dia)', desc_lower)
-        for size in pipe_sizes[:1]:
-            keywords.append(f"{size}mm")
-        
-        # Extract power ratings
-        power = re.findall(r'(\d+(?:\.\d+)?)\s*(?:kw|kva|hp|amp)', desc_lower)
-        for p in power[:1]:
-            keywords.append(f"{p}kw")
-        
-        # Material keywords
-        materials = ['copper', 'pvc', 'cpvc', 'hdpe', 'galvanized', 'steel',
-                    'aluminum', 'xlpe', 'swa', 'armored']
-        for mat in materials:
-            if mat in desc_lower:
-                keywords.append(mat)
-        
-        # Key services terms
-        terms = ['electrical', 'plumbing', 'hvac', 'cable', 'pipe', 'conduit',
-                 'panel', 'socket', 'switch', 'light', 'pump', 'valve',
-                 'air_conditioning', 'ventilation', 'fire_alarm']
-        
-        for term in terms:
-            if term.replace('_', ' ') in desc_lower:
-                keywords.append(term)
+    def build_keywords(self, descriptions, subcategories, desc_lower=None, masks=None):
+        """Search keywords for aligned Series of descriptions and subcategories"""
+        if desc_lower is None:
+            desc_lower = descriptions.str.lower()
+        if masks is None:
+            masks = {}
+        
+        # First cable size, pipe size and power rating (NaN where absent)
+        cable = desc_lower.str.extract(_CABLE_SIZE_RE)
+        columns = [
+            cable[0] + 'x' + cable[1] + 'sqmm',
+            desc_lower.str.extract(_PIPE_SIZE_RE)[0] + 'mm',
+            desc_lower.str.extract(_POWER_RE)[0] + 'kw',
+        ]
+        
+        # Material and services terms, one substring scan per term
+        for term in KEYWORD_MATERIALS + KEYWORD_TERMS:
+            present = substring_mask(desc_lower, term.replace('_', ' '), masks)
+            columns.append(pd.Series(np.where(present, term, ''), index=desc_lower.index))
         
         # Add subcategory keyword
-        if subcategory:
-            keywords.append(subcategory.lower().replace(' ', '_'))
-        
-        # Limit and remove duplicates
-        seen = set()
-        unique_keywords = []
-        for kw in keywords:
-            if kw not in seen:
-                seen.add(kw)
-                unique_keywords.append(kw)
-        
-        return unique_keywords[:6]
+        columns.append(subcategories.str.lower().str.replace(' ', '_'))
+        
+        frame = pd.concat(columns, axis=1)
+        return [list(dict.fromkeys(kw for kw in row if isinstance(kw, str) and kw))[:6]
+                for row in frame.itertuples(index=False, name=None)]
     
     def is_row_bold(self, row_idx):
         """Check if column B in a row is bold"""
-        try:
-            from openpyxl import load_workbook
-            if not hasattr(self, 'worksheet'):
-                wb = load_workbook(self.excel_file, read_only=True, data_only=True)
-                self.worksheet = wb[self.sheet_name]
-            
-            cell = self.worksheet.cell(row=row_idx + 1, column=2)  # Column B
-            if cell and cell.font and cell.font.bold:
-                return True
-            return False
-        except:
-            return False
+        return row_idx in self._bold_row_set
     
     def extract_items(self):
         """Main extraction method"""
@@ -425,44 +473,58 @@ class ServicesExtractor:
         
         print(f"\nExtracting items from {self.sheet_name}...")
         
-        # Load worksheet for bold detection
-        try:
-            from openpyxl import load_workbook
-            wb = load_workbook(self.excel_file, read_only=True, data_only=True)
-            self.worksheet = wb[self.sheet_name]
-        except:
-            self.worksheet = None
-        
-        items = []
-        current_id = 1
+        # Column-at-a-time passes over the whole sheet; only rows with a code
+        # in column A become items, so only their descriptions are normalized
+        descriptions = self.build_descriptions(rows=self.df[0].notna().to_numpy())
+        rates = self.build_rates()
+        lowered = descriptions.str.lower()
+        
+        # The row walk below only tracks section state and collects one
+        # record per item; derived fields are filled in column-wise after it
+        item_rows = []
+        item_codes = []
+        item_descriptions = []
+        item_units = []
+        item_subcategories = []
         current_header = None  # Track current header description
         current_subcategory = "General Services"  # Default subcategory
         
+        # Walk plain object rows - no Series built per row
+        values = self.df.to_numpy(dtype=object)
+        # Not-null mask for the whole sheet, instead of pd.notna per cell
+        notna = self.df.notna().to_numpy()
+        # Section number of every row (0 = between/after sections)
+        sections = np.zeros(len(values), dtype=np.int8)
+        for section_id, (first_row, last_row) in SECTION_ROWS.items():
+            sections[first_row:last_row + 1] = section_id
+        # Section 1 header rows: over 10 chars of text in column B, no code in
+        # column A, and not a column heading or preamble
+        col_b = self.df[1].astype(str).str.strip()
+        header_rows = (notna[:, 1] & ~notna[:, 0] & (col_b.str.len() > 10).to_numpy()
+                       & ~col_b.str.lower().str.contains(_HEADER_SKIP_RE).to_numpy())
+        
         # Process all rows starting from row 10
-        for row_idx in range(10, len(self.df)):
-            row = self.df.iloc[row_idx]
+        for row_idx in range(10, len(values)):
+            row = values[row_idx]
+            filled = notna[row_idx]
+            section = sections[row_idx]
             
             # Determine which section we're in and apply appropriate logic
-            if 12 <= row_idx <= 307:  # Rows 13-308 (0-indexed: 12-307)
+            if section == 1:  # Rows 13-308 (0-indexed: 12-307)
                 # Section 1: Header + Range pattern
                 # Check if this row has a header description in column B
-                if pd.notna(row[1]):
-                    desc_text = str(row[1]).strip()
-                    # Check if it's a header (has text but no code in column A)
-                    if pd.isna(row[0]) and len(desc_text) > 10:
-                        # Skip certain rows
-                        if not any(skip in desc_text.lower() for skip in ['description', 'preambles', 'all items below']):
-                            current_header = desc_text
-                            continue
+                if header_rows[row_idx]:
+                    current_header = str(row[1]).strip()
+                    continue
             
-            elif 309 <= row_idx <= 345:  # Rows 310-346 (0-indexed: 309-345)
+            elif section == 2:  # Rows 310-346 (0-indexed: 309-345)
                 # Section 2: Normal pattern with bold subcategories
                 # Reset header when entering this section
                 if row_idx == 309:
                     current_header = None
                 
                 # Check for bold subcategory
-                if pd.notna(row[1]) and self.is_row_bold(row_idx):
+                if filled[1] and self.is_row_bold(row_idx):
                     current_subcategory = str(row[1]).strip()
                     continue
                 
@@ -471,38 +533,38 @@ class ServicesExtractor:
                     if current_subcategory == "General Services":
                         current_subcategory = "Services Works"
             
-            elif 347 <= row_idx <= 687:  # Rows 348-688 (0-indexed: 347-687)
+            elif section == 3:  # Rows 348-688 (0-indexed: 347-687)
                 # Section 3: Header + column C pattern
                 # Check if this is a header row (bold text in column B)
-                if pd.notna(row[1]) and self.is_row_bold(row_idx):
+                if filled[1] and self.is_row_bold(row_idx):
                     current_header = str(row[1]).strip()
                     continue
             
-            elif 689 <= row_idx <= 806:  # Rows 690-807 (0-indexed: 689-806)
+            elif section == 4:  # Rows 690-807 (0-indexed: 689-806)
                 # Section 4: Normal pattern with bold subcategories
                 # Check for bold subcategory
-                if pd.notna(row[1]) and self.is_row_bold(row_idx):
+                if filled[1] and self.is_row_bold(row_idx):
                     current_subcategory = str(row[1]).strip()
                     continue
             
             # Check if this row has a code in column A
-            code = self.extract_code(row)
+            code = self.extract_code(row, filled=filled)
             if not code:
                 continue
             
             # Build description based on section
             description = None
             
-            if 12 <= row_idx <= 307:  # Section 1: Header + Range
+            if section == 1:  # Section 1: Header + Range
                 # Check if this is a range-based row (has data in columns C-E)
-                has_range = (pd.notna(row[2]) or pd.notna(row[3]) or pd.notna(row[4]))
+                has_range = (filled[2] or filled[3] or filled[4])
                 
                 if has_range and current_header:
                     # This is a range row - combine header with range info
                     # Collect non-empty range parts
-                    col_c = str(row[2]).strip() if pd.notna(row[2]) else None
-                    col_d = str(row[3]).strip() if pd.notna(row[3]) else None
-                    col_e = str(row[4]).strip() if pd.notna(row[4]) else None
+                    col_c = str(row[2]).strip() if filled[2] else None
+                    col_d = str(row[3]).strip() if filled[3] else None
+                    col_e = str(row[4]).strip() if filled[4] else None
                     
                     # Build the range/value string based on what's present
                     if current_header.endswith(':'):
@@ -531,47 +593,47 @@ class ServicesExtractor:
                         # Header doesn't end with colon, use semicolon separator
                         value_str = ' '.join(filter(None, [col_c, col_d, col_e]))
                         description = f"{current_header}; {value_str}".strip()
-                elif pd.notna(row[1]):
+                elif filled[1]:
                     # Has its own description in column B
-                    description = self.extract_description(row)
+                    description = descriptions.iat[row_idx]
                 else:
                     # No description available - skip
                     continue
             
-            elif 309 <= row_idx <= 345:  # Section 2: Normal pattern
+            elif section == 2:  # Section 2: Normal pattern
                 # Normal items with description in column B
-                if pd.notna(row[1]):
-                    description = self.extract_description(row)
+                if filled[1]:
+                    description = descriptions.iat[row_idx]
                 else:
                     continue
             
-            elif 347 <= row_idx <= 687:  # Section 3: Header + column C
+            elif section == 3:  # Section 3: Header + column C
                 # Combine header with column C value
-                if current_header and pd.notna(row[2]):  # Column C has the value
+                if current_header and filled[2]:  # Column C has the value
                     col_c = str(row[2]).strip()
                     if current_header.endswith(':'):
                         description = f"{current_header} {col_c}".strip()
                     else:
                         description = f"{current_header}; {col_c}".strip()
-                elif pd.notna(row[1]):
+                elif filled[1]:
                     # Has its own description in column B
-                    description = self.extract_description(row)
+                    description = descriptions.iat[row_idx]
                 else:
                     continue
             
-            elif 689 <= row_idx <= 806:  # Section 4: Normal pattern with bold subcategories
+            elif section == 4:  # Section 4: Normal pattern with bold subcategories
                 # Check if description is in column B or C
-                if pd.notna(row[1]):
-                    description = self.extract_description(row)
-                elif pd.notna(row[2]):
+                if filled[1]:
+                    description = descriptions.iat[row_idx]
+                elif filled[2]:
                     # Description is in column C for this section
                     description = str(row[2]).strip()
                 else:
                     continue
             else:
                 # Default case - try to get description from column B
-                if pd.notna(row[1]):
-                    description = self.extract_description(row)
+                if filled[1]:
+                    description = descriptions.iat[row_idx]
                 else:
                     continue
             
@@ -579,55 +641,60 @@ class ServicesExtractor:
             if not description or len(description) < 5:
                 continue
             
-            # Extract rate from column I (index 8)
-            rate = None
-            rate_cell_ref = None
-            rate_value = None
+            item_rows.append(row_idx)
+            item_codes.append(code)
+            item_descriptions.append(description)
             
-            if len(row) > 8 and pd.notna(row[8]):
-                try:
-                    value = float(str(row[8]).replace(',', '').replace('£', ''))
-                    if value > 0:
-                        rate = value
-                        rate_value = value
-                        rate_cell_ref = f"Services!{self.get_cell_reference(row_idx, 8)}"
-                except:
-                    pass
+            # Get unit - inferred from this row's own description, not the header-based one
+            item_units.append(self.extract_unit(row, description=descriptions.iat[row_idx],
+                                                desc_lower=lowered.iat[row_idx], filled=filled))
             
-            # Get unit
-            unit = self.extract_unit(row)
-            
-            # Determine categories
             # Use current_subcategory for sections 2 and 4, otherwise determine from description
-            if (309 <= row_idx <= 345) or (689 <= row_idx <= 806):
-                subcategory = current_subcategory
+            if section == 2 or section == 4:
+                item_subcategories.append(current_subcategory)
             else:
-                subcategory = self.determine_subcategory(description)
-            
-            # Generate keywords
-            keywords = self.generate_keywords(description, subcategory)
-            
-            # Get cell references
-            excel_ref = f"Services!{self.get_cell_reference(row_idx, 0)}"
-            
-            # Create item
-            item = {
-                'id': current_id,  # Use simple numeric ID like Groundworks
-                'code': code,  # Use actual code from Excel
-                'description': description,
-                'unit': unit,
-                'category': 'Services',
-                'subcategory': subcategory,
-                'rate': rate if rate else 0.0,  # Default to 0.0 if no rate
-                'cellRate_reference': rate_cell_ref if rate_cell_ref else '',
-                'cellRate_rate': rate_value if rate_value else 0.0,
-                'excelCellReference': excel_ref,
-                'sourceSheetName': self.sheet_name,
-                'keywords': keywords
-            }
-            
-            items.append(item)
-            current_id += 1
+                item_subcategories.append(None)
+        
+        # Determine categories
+        item_descriptions = pd.Series(item_descriptions, dtype=object)
+        desc_lower = item_descriptions.str.lower()
+        subcategories = pd.Series(item_subcategories, dtype=object)
+        from_description = subcategories.isna()
+        # Classification and keywords test many of the same words - share their substring masks
+        masks = {}
+        classified = self.classify_subcategories(item_descriptions, desc_lower, masks)
+        subcategories[from_description] = classified[from_description]
+        
+        # Generate keywords
+        keywords = self.build_keywords(item_descriptions, subcategories, desc_lower, masks)
+        
+        # Rate from column I (index 8), 0.0 and no cell reference if missing
+        item_rates = rates.iloc[item_rows].fillna(0.0)
+        
+        # Cell references for all items at once
+        row_numbers = pd.Series(item_rows, dtype=np.int64).add(1).astype(str)
+        code_refs = (f"{self.sheet_name}!{_COL_LETTERS[0]}" + row_numbers).tolist()
+        rate_refs = (f"{self.sheet_name}!{_COL_LETTERS[8]}" + row_numbers).where(
+            item_rates.to_numpy() > 0, '').tolist()
+        item_rates = item_rates.tolist()
+        
+        # One list per output field, in the CSV column order
+        count = len(item_rows)
+        columns = {
+            'id': list(range(1, count + 1)),  # Use simple numeric ID like Groundworks
+            'code': item_codes,  # Use actual code from Excel
+            'description': item_descriptions.tolist(),
+            'unit': item_units,
+            'category': ['Services'] * count,
+            'subcategory': subcategories.tolist(),
+            'rate': item_rates,
+            'cellRate_reference': rate_refs,
+            'cellRate_rate': item_rates,
+            'excelCellReference': code_refs,
+            'sourceSheetName': [self.sheet_name] * count,
+            'keywords': keywords,
+        }
+        items = [dict(zip(columns, values)) for values in zip(*columns.values())]
         
         self.extracted_items = items
         print(f"Extracted {len(items)} valid items from {self.sheet_name}")
@@ -641,14 +708,14 @@ class ServicesExtractor:
         
         # Save JSON
         json_file = f"{output_prefix}_extracted.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(self.extracted_items, f, indent=2, ensure_ascii=False)
+        Path(json_file).write_bytes(orjson.dumps(
+            self.extracted_items, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         print(f"Saved JSON: {json_file}")
         
         # Save CSV
         df = pd.DataFrame(self.extracted_items)
         # Convert keywords list to comma-separated string
-        df['keywords'] = df['keywords'].apply(lambda x: ','.join(x) if x else '')
+        df['keywords'] = df['keywords'].str.join(',')
         
         # Ensure column order matches Groundworks format
         column_order = ['id', 'code', 'description', 'unit', 'category', 'subcategory', 
@@ -694,13 +761,10 @@ def main():
         print(f"Items with cell references: {sum(1 for i in items if i['cellRate_reference'])}")
         
         # Subcategory distribution
-        subcats = {}
-        for item in items:
-            subcat = item['subcategory']
-            subcats[subcat] = subcats.get(subcat, 0) + 1
+        subcats = Counter(item['subcategory'] for item in items)
         
         print("\nSubcategory distribution:")
-        for subcat, count in sorted(subcats.items(), key=lambda x: x[1], reverse=True)[:5]:
+        for subcat, count in subcats.most_common(5):
             print(f"  {subcat}: {count}")
 
 if __name__ == "__main__":
@@ -5,40 +5,143 @@ Ensures consistent format across all extractors
 
 import pandas as pd
 import numpy as np
-import json
 import re
+import zipfile
 from pathlib import Path
-import string
+from openpyxl import load_workbook
+from openpyxl.utils import get_column_letter
+
+# orjson serializes the output several times faster than the stdlib encoder
+import orjson
+
+# python-calamine (Rust) parses xlsx far faster than openpyxl; pandas uses it
+# as the 'calamine' engine, with a pyarrow-backed frame
+READ_EXCEL_KWARGS = {'engine': 'calamine', 'dtype_backend': 'pyarrow'}
+
+# Bold font element (<b/>, <b val="1"/>, optionally namespaced) in styles.xml
+_BOLD_FONT_RE = re.compile(rb'<(?:\w+:)?b(?:\s[^>]*)?/?>')
+
+# Excel column letters A..ZZ by 0-based column index
+_COL_LETTERS = tuple(get_column_letter(col_idx + 1) for col_idx in range(702))
+
+# Thousands separators and currency symbols stripped from rate cells
+_RATE_STRIP = str.maketrans('', '', ',£$')
+# A number as float() reads it - checked first so text cells don't raise
+_NUMBER_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+
+UNITS = frozenset({'m', 'm2', 'm²', 'm3', 'm³', 'mm', 'nr', 'no', 'item', 'sum',
+                   'kg', 'tonnes', 't', 'lm', 'sqm', 'cum', 'each', 'set',
+                   'l.s.', 'ls', 'hour', 'hr', 'day', 'week', 'month'})
+
+# Unit spellings mapped to their standard (plain text) form
+UNIT_MAP = {
+    'm2': 'm2', 'sqm': 'm2', 'sq.m': 'm2', 'sq m': 'm2', 'm²': 'm2',
+    'm3': 'm3', 'cum': 'm3', 'cu.m': 'm3', 'cu m': 'm3', 'm³': 'm3',
+    'no': 'nr', 'no.': 'nr', 'each': 'nr', 'number': 'nr',
+    't': 'tonnes', 'ton': 'tonnes', 'tonne': 'tonnes',
+    'lm': 'm', 'lin.m': 'm', 'l.m': 'm', 'lin m': 'm',
+    'l.s.': 'sum', 'ls': 'sum', 'lump sum': 'sum',
+    'hr': 'hour', 'hrs': 'hour',
+}
 
 class BaseExtractor:
     def __init__(self, excel_file='MJD-PRICELIST.xlsx', sheet_name=''):
         self.excel_file = excel_file
         self.sheet_name = sheet_name
+        # Sheet name as used in cell references (spaces removed)
+        self.sheet_name_ref = sheet_name.replace(' ', '')
         self.df = None
         self.extracted_items = []
+        # Columns to read (pd.read_excel usecols) - None reads the whole sheet
+        self.sheet_columns = None
+        self.workbook = None
+        self.worksheet = None
+        self._bold_row_set = frozenset()
+        # Cache of description -> (subcategory, keywords, inferred unit)
+        self._desc_cache = {}
         
     def load_sheet(self):
         """Load the sheet"""
         print(f"Loading {self.sheet_name} sheet...")
-        self.df = pd.read_excel(self.excel_file, sheet_name=self.sheet_name, header=None)
+        self.df = pd.read_excel(self.excel_file, sheet_name=self.sheet_name, header=None,
+                                usecols=self.sheet_columns, **READ_EXCEL_KWARGS)
         print(f"Loaded {len(self.df)} rows x {len(self.df.columns)} columns")
         return self.df
     
+    def load_workbook_for_formatting(self):
+        """Scan the workbook once with openpyxl and record which rows are bold"""
+        self._bold_row_set = frozenset()
+        if not self.workbook_has_bold_fonts():
+            print(f"No bold fonts defined in workbook, skipping formatting detection")
+            return
+        
+        try:
+            self.workbook = load_workbook(self.excel_file, read_only=True, data_only=True)
+            self.worksheet = self.workbook[self.sheet_name]
+            print(f"Loaded workbook for formatting detection")
+            
+            bold_rows = set()
+            # The stored sheet size can be wrong - scan to the last row actually present
+            self.worksheet.reset_dimensions()
+            # Check first 5 columns for bold text
+            for row_idx, cells in enumerate(self.worksheet.iter_rows(max_col=5)):
+                row_is_bold = False
+                for cell in cells:
+                    if cell.value:
+                        if cell.font and cell.font.bold:
+                            row_is_bold = True
+                        else:
+                            # If any cell with content is not bold, row is not fully bold
+                            row_is_bold = False
+                            break
+                if row_is_bold:
+                    bold_rows.add(row_idx)
+            self._bold_row_set = frozenset(bold_rows)
+        except Exception as e:
+            print(f"Warning: Could not load workbook for formatting: {e}")
+        finally:
+            # Everything needed is in the bold row set, release the workbook
+            if self.workbook is not None:
+                self.workbook.close()
+            self.workbook = None
+            self.worksheet = None
+    
+    def workbook_has_bold_fonts(self):
+        """Cheap check of styles.xml for any bold font definition"""
+        try:
+            with zipfile.ZipFile(self.excel_file) as archive:
+                styles = archive.read('xl/styles.xml')
+        except (KeyError, OSError, zipfile.BadZipFile):
+            # Can't tell without the styles part - do the full scan
+            return True
+        return _BOLD_FONT_RE.search(styles) is not None
+    
+    def is_row_bold(self, row_idx):
+        """Check if all non-empty cells in a row are bold"""
+        return row_idx in self._bold_row_set
+    
+    def describe(self, description):
+        """Subcategory, keywords tuple and inferred unit from the subclass's description helpers"""
+        # Pure functions of the text, so repeated descriptions (size variants etc.) are looked up
+        cached = self._desc_cache.get(description)
+        if cached is None:
+            # Lowercase once and share it between the three helpers
+            desc_lower = description.lower()
+            cached = (
+                self.determine_subcategory(description, desc_lower),
+                tuple(self.generate_keywords(description, desc_lower)),
+                self.infer_unit_from_description(description, desc_lower),
+            )
+            self._desc_cache[description] = cached
+        return cached
+    
     def get_cell_reference(self, row_idx, col_idx):
         """Convert row and column index to Excel cell reference"""
-        if col_idx < 26:
-            col_letter = string.ascii_uppercase[col_idx]
-        else:
-            col_letter = string.ascii_uppercase[col_idx // 26 - 1] + string.ascii_uppercase[col_idx % 26]
-        
-        return f"{col_letter}{row_idx + 1}"
+        return f"{_COL_LETTERS[col_idx]}{row_idx + 1}"
     
     def get_sheet_cell_reference(self, row_idx, col_idx):
         """Get full cell reference with sheet name (e.g., 'Groundworks!F20')"""
-        cell_ref = self.get_cell_reference(row_idx, col_idx)
-        # Remove spaces from sheet name for reference
-        sheet_name_ref = self.sheet_name.replace(' ', '')
-        return f"{sheet_name_ref}!{cell_ref}"
+        return f"{self.sheet_name_ref}!{_COL_LETTERS[col_idx]}{row_idx + 1}"
     
     def extract_code(self, row, col_idx=0):
         """Extract code from row - tries to get actual Excel code"""
@@ -53,42 +156,16 @@ class BaseExtractor:
     
     def is_unit(self, value):
         """Check if value is a unit"""
-        if pd.isna(value):
-            return False
-        
-        value_str = str(value).strip().lower()
-        
-        # Don't treat numbers as units
-        try:
-            float(value_str)
-            return False
-        except:
-            pass
-        
-        units = ['m', 'm2', 'm²', 'm3', 'm³', 'mm', 'nr', 'no', 'item', 'sum',
-                 'kg', 'tonnes', 't', 'lm', 'sqm', 'cum', 'each', 'set',
-                 'l.s.', 'ls', 'hour', 'hr', 'day', 'week', 'month']
-        
-        # Check for exact match only
-        return value_str in units
+        # Exact match only - no unit parses as a number, so numbers never match
+        return False if pd.isna(value) else str(value).strip().lower() in UNITS
     
     def standardize_unit(self, unit):
         """Standardize unit format - using plain text for better compatibility"""
         if not unit:
             return 'item'
             
-        unit_map = {
-            'm2': 'm2', 'sqm': 'm2', 'sq.m': 'm2', 'sq m': 'm2', 'm²': 'm2',
-            'm3': 'm3', 'cum': 'm3', 'cu.m': 'm3', 'cu m': 'm3', 'm³': 'm3',
-            'no': 'nr', 'no.': 'nr', 'each': 'nr', 'number': 'nr',
-            't': 'tonnes', 'ton': 'tonnes', 'tonne': 'tonnes',
-            'lm': 'm', 'lin.m': 'm', 'l.m': 'm', 'lin m': 'm',
-            'l.s.': 'sum', 'ls': 'sum', 'lump sum': 'sum',
-            'hr': 'hour', 'hrs': 'hour',
-        }
-        
         unit_lower = unit.lower().strip()
-        return unit_map.get(unit_lower, unit_lower)
+        return UNIT_MAP.get(unit_lower, unit_lower)
     
     def extract_rate(self, row, start_col=3, end_col=10):
         """Extract rate value from typical rate columns - always returns a column index"""
@@ -100,15 +177,14 @@ class BaseExtractor:
             if pd.notna(row[col_idx]):
                 value = str(row[col_idx]).strip()
                 # Check if it's a number
-                value_clean = value.replace(',', '').replace('£', '').replace('$', '')
-                try:
-                    rate = float(value_clean)
-                    if rate >= 0 and rate < 1000000:  # Allow 0 rates, sanity check for upper bound
-                        rate_value = rate
-                        rate_col = col_idx
-                        break  # Found a valid rate
-                except:
+                value_clean = value.translate(_RATE_STRIP).strip()
+                if not _NUMBER_RE.fullmatch(value_clean):
                     continue
+                rate = float(value_clean)
+                if rate >= 0 and rate < 1000000:  # Allow 0 rates, sanity check for upper bound
+                    rate_value = rate
+                    rate_col = col_idx
+                    break  # Found a valid rate
         
         # If no rate found, still return the expected rate column
         # For most sheets, rate is in column F (index 5)
@@ -127,6 +203,30 @@ class BaseExtractor:
         
         return rate_value, rate_col
     
+    def build_rates(self, start_col=3, end_col=10):
+        """Vectorized extract_rate over every row - returns (rates, rate column indexes) lists"""
+        columns = range(start_col, min(end_col, len(self.df.columns)))
+        # Parsed value of each candidate cell, NaN where it is not a valid rate
+        parsed = np.full((len(self.df), len(columns)), np.nan)
+        for offset, col_idx in enumerate(columns):
+            cells = self.df[col_idx]
+            text = cells.astype(str).str.translate(_RATE_STRIP).str.strip()
+            numeric = (cells.notna() & text.str.fullmatch(_NUMBER_RE)).to_numpy(dtype=bool)
+            # astype parses like float() - to_numeric's fast parser can be off in the last digit
+            values = text.where(numeric).astype(np.float64).to_numpy()
+            # Allow 0 rates, sanity check for upper bound
+            parsed[:, offset] = np.where((values >= 0) & (values < 1000000), values, np.nan)
+        
+        found = ~np.isnan(parsed)
+        has_rate = found.any(axis=1)
+        first = found.argmax(axis=1) if len(columns) else np.zeros(len(self.df), dtype=np.intp)
+        
+        # Without a rate, extract_rate's fallback column: F, else E, else D
+        fallback_col = 5 if len(self.df.columns) > 5 else 4 if len(self.df.columns) > 4 else 3
+        rates = np.where(has_rate, parsed[np.arange(len(self.df)), first], 0)
+        rate_cols = np.where(has_rate, first + start_col, fallback_col)
+        return rates.tolist(), rate_cols.tolist()
+    
     def create_item(self, row_idx, row, code=None, description='', unit='item', 
                    subcategory='', rate=None, rate_col_idx=None, keywords=None):
         """Create standardized item dictionary"""
@@ -170,13 +270,13 @@ class BaseExtractor:
         
         # Save JSON
         json_file = f"{output_prefix}_extracted.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(self.extracted_items, f, indent=2, ensure_ascii=False)
+        Path(json_file).write_bytes(orjson.dumps(
+            self.extracted_items, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         print(f"Saved JSON: {json_file}")
         
         # Save CSV
         df = pd.DataFrame(self.extracted_items)
-        df['keywords'] = df['keywords'].apply(lambda x: '|'.join(x) if isinstance(x, list) else '')
+        df['keywords'] = ['|'.join(x) if isinstance(x, list) else '' for x in df['keywords']]
         csv_file = f"{output_prefix}_extracted.csv"
         df.to_csv(csv_file, index=False)
         print(f"Saved CSV: {csv_file}")
@@ -5,11 +5,15 @@ Returns the standardized format with all required fields including cell mappings
 """
 
 import pandas as pd
-import json
 from datetime import datetime
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import sys
 
+# orjson serializes the output several times faster than the stdlib encoder
+import orjson
+
 # Import all extractors
 from extract_groundworks import GroundworksExtractor
 from extract_rc_works import RCWorksExtractor
@@ -18,6 +22,11 @@ from extract_services import ServicesExtractor
 from extract_external_works import ExternalWorksExtractor
 from extract_underpinning import UnderpinningExtractor
 
+def run_extractor(ExtractorClass, excel_file):
+    """Run one sheet extractor - module level so worker processes can pickle it"""
+    extractor = ExtractorClass(excel_file)
+    return extractor.extract_items()
+
 class MasterPricelistExtractor:
     def __init__(self, excel_file='MJD-PRICELIST.xlsx'):
         self.excel_file = excel_file
@@ -31,8 +40,14 @@ class MasterPricelistExtractor:
             'Underpinning': UnderpinningExtractor
         }
         
-    def extract_all_sheets(self):
-        """Extract data from all 6 sheets"""
+    def extract_all_sheets(self, parallel=True):
+        """Extract data from all 6 sheets
+
+        Sheets are independent, so with parallel=True each extractor runs in its
+        own worker process; results are still collected in sheet order. Every
+        sheet's header is printed when it is submitted, and the workers' own
+        log lines interleave after the headers.
+        """
         print("="*80)
         print("MASTER PRICELIST EXTRACTION")
         print("="*80)
@@ -42,36 +57,48 @@ class MasterPricelistExtractor:
         all_extracted = []
         extraction_stats = {}
         
-        for sheet_name, ExtractorClass in self.extractors.items():
-            print(f"\n>>> Processing {sheet_name}...")
-            print("-"*40)
-            
-            try:
-                # Create extractor instance
-                extractor = ExtractorClass(self.excel_file)
-                
-                # Extract items
-                items = extractor.extract_items()
+        if parallel:
+            with ProcessPoolExecutor() as executor:
+                futures = {}
+                for sheet_name, ExtractorClass in self.extractors.items():
+                    print(f"\n>>> Processing {sheet_name}...")
+                    print("-"*40)
+                    futures[sheet_name] = executor.submit(run_extractor, ExtractorClass, self.excel_file)
                 
-                if items:
-                    all_extracted.extend(items)
-                    extraction_stats[sheet_name] = {
-                        'total': len(items),
-                        'with_rates': sum(1 for i in items if i.get('rate')),
-                        'with_cells': sum(1 for i in items if i.get('cellRate_reference'))
-                    }
-                    print(f"[OK] Extracted {len(items)} items from {sheet_name}")
-                else:
-                    extraction_stats[sheet_name] = {'total': 0, 'with_rates': 0, 'with_cells': 0}
-                    print(f"[X] No items extracted from {sheet_name}")
-                    
-            except Exception as e:
-                print(f"[ERROR] Error processing {sheet_name}: {str(e)}")
-                extraction_stats[sheet_name] = {'error': str(e)}
+                for sheet_name, future in futures.items():
+                    self._collect_sheet(sheet_name, future.result, all_extracted, extraction_stats)
+        else:
+            for sheet_name, ExtractorClass in self.extractors.items():
+                print(f"\n>>> Processing {sheet_name}...")
+                print("-"*40)
+                extract = partial(run_extractor, ExtractorClass, self.excel_file)
+                self._collect_sheet(sheet_name, extract, all_extracted, extraction_stats)
         
         self.all_items = all_extracted
         return all_extracted, extraction_stats
     
+    def _collect_sheet(self, sheet_name, extract, all_extracted, extraction_stats):
+        """Call extract() for one sheet's items and record them and their stats"""
+        try:
+            # Extract items - run here, or a worker future's result
+            items = extract()
+            
+            if items:
+                all_extracted.extend(items)
+                extraction_stats[sheet_name] = {
+                    'total': len(items),
+                    'with_rates': sum(1 for i in items if i.get('rate')),
+                    'with_cells': sum(1 for i in items if i.get('cellRate_reference'))
+                }
+                print(f"[OK] Extracted {len(items)} items from {sheet_name}")
+            else:
+                extraction_stats[sheet_name] = {'total': 0, 'with_rates': 0, 'with_cells': 0}
+                print(f"[X] No items extracted from {sheet_name}")
+                
+        except Exception as e:
+            print(f"[ERROR] Error processing {sheet_name}: {str(e)}")
+            extraction_stats[sheet_name] = {'error': str(e)}
+    
     def standardize_items(self):
         """Ensure all items have the standardized format"""
         print("\nStandardizing all items...")
@@ -127,8 +154,8 @@ class MasterPricelistExtractor:
         
         # Save JSON
         json_file = f"{prefix}.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(self.all_items, f, indent=2, ensure_ascii=False)
+        Path(json_file).write_bytes(orjson.dumps(
+            self.all_items, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY))
         print(f"[OK] Saved JSON: {json_file}")
         
         # Prepare CSV data
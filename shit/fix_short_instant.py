@@ -5,8 +5,14 @@ No API calls - immediate results
 
 import json
 import pandas as pd
+import numpy as np
+from bisect import bisect_right
+from itertools import accumulate
 from pathlib import Path
 
+# orjson serializes the output several times faster than the stdlib encoder
+import orjson
+
 # Comprehensive construction terms dictionary
 DESCRIPTION_EXPANSIONS = {
     # Single word items
@@ -153,6 +159,24 @@ DESCRIPTION_EXPANSIONS = {
     "-": "As per drawings/specification"
 }
 
+# Partial matching: the first key (in dictionary order) that appears in the
+# description, or that contains the description
+_EXPANSION_KEYS = list(DESCRIPTION_EXPANSIONS)
+# All keys in one string, so the first key containing a description is one str.find
+_KEYS_TEXT = '\0'.join(_EXPANSION_KEYS)
+_KEY_STARTS = [0, *accumulate(len(key) + 1 for key in _EXPANSION_KEYS[:-1])]
+
+def find_partial_expansion(desc_clean: str):
+    """Expansion of the first key found in desc_clean or containing it, else None"""
+    best = next((order for order, key in enumerate(_EXPANSION_KEYS) if key in desc_clean), None)
+    
+    pos = _KEYS_TEXT.find(desc_clean)
+    if pos != -1:
+        order = bisect_right(_KEY_STARTS, pos) - 1
+        best = order if best is None else min(best, order)
+    
+    return None if best is None else DESCRIPTION_EXPANSIONS[_EXPANSION_KEYS[best]]
+
 def expand_short_description(desc: str, category: str = "", unit: str = "") -> str:
     """Expand a short description using dictionary and context"""
     
@@ -170,9 +194,9 @@ def expand_short_description(desc: str, category: str = "", unit: str = "") -> s
         return DESCRIPTION_EXPANSIONS[desc_clean[:-1]]
     
     # Try to find partial match
-    for key, value in DESCRIPTION_EXPANSIONS.items():
-        if key in desc_clean or desc_clean in key:
-            return value
+    partial = find_partial_expansion(desc_clean)
+    if partial is not None:
+        return partial
     
     # Context-based expansion
     if len(desc) < 10:
@@ -201,6 +225,7 @@ def main():
     # Load data
     input_file = "pricelist_final_clean.json"
     print(f"\nLoading {input_file}...")
+    # json.load, not orjson - the extracted files can hold NaN, which orjson rejects
     with open(input_file, 'r', encoding='utf-8') as f:
         data = json.load(f)
     
@@ -209,31 +234,32 @@ def main():
     # Find and fix short descriptions
     print("\nFixing short descriptions...")
     
+    # Check which items need fixing - one column-wise pass over all descriptions
+    descriptions = pd.Series([item.get('description', '') for item in data], dtype=object)
+    lengths = descriptions.str.len()
+    needs_fix = (lengths < 10) | ((descriptions.str.split().str.len() == 1) & (lengths < 20))
+    
     fixed_count = 0
-    for item in data:
-        desc = item.get('description', '')
+    for idx in np.flatnonzero(needs_fix.to_numpy()):
+        item = data[idx]
+        original = desc = item.get('description', '')
+        expanded = expand_short_description(
+            desc, 
+            item.get('category', ''),
+            item.get('unit', '')
+        )
         
-        # Check if needs fixing
-        if len(desc) < 10 or (len(desc.split()) == 1 and len(desc) < 20):
-            original = desc
-            expanded = expand_short_description(
-                desc, 
-                item.get('category', ''),
-                item.get('unit', '')
-            )
-            
-            if expanded != desc:
-                item['original_short_description'] = original
-                item['description'] = expanded
-                item['dictionary_expanded'] = True
-                fixed_count += 1
+        if expanded != desc:
+            item['original_short_description'] = original
+            item['description'] = expanded
+            item['dictionary_expanded'] = True
+            fixed_count += 1
     
     print(f"Fixed {fixed_count} short descriptions instantly!")
     
     # Save results
     output_json = "pricelist_final_perfect.json"
-    with open(output_json, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    Path(output_json).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
     
     print(f"\nSaved JSON: {output_json}")
     